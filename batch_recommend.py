@@ -0,0 +1,46 @@
+"""Batch entry point: recommend crops for every point in a CSV of coordinates.
+
+Usage: python batch_recommend.py points.csv month year [output.csv] [k]
+
+points.csv needs "lat" and "lon" columns. The output has one row per point and
+rank. Points whose reports are missing sensor values are listed as "No data"
+instead of prompting.
+"""
+import csv
+import sys
+
+from engine import RecommendationEngine
+
+def read_points(filepath):
+    with open(filepath, newline='') as csvfile:
+        return [(float(row['lat']), float(row['lon'])) for row in csv.DictReader(csvfile)]
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 3:
+        print(__doc__)
+        return 1
+    points = read_points(argv[0])
+    month, year = int(argv[1]), int(argv[2])
+    output = argv[3] if len(argv) > 3 else 'batch_recommendations.csv'
+    k = int(argv[4]) if len(argv) > 4 else 5
+
+    engine = RecommendationEngine()
+    if not engine.warm_up():
+        print("Error: No crop data found.")
+        return 1
+    results = engine.recommend_many(points, month, year, k=k)
+    with open(output, 'w', newline='') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['lat', 'lon', 'rank', 'crop', 'fitness'])
+        for (lat, lon), ranked in zip(points, results):
+            if ranked is None:
+                writer.writerow([lat, lon, '', 'No data', ''])
+                continue
+            for rank, (crop, fitness) in enumerate(ranked, start=1):
+                writer.writerow([lat, lon, rank, crop, f"{fitness:.6f}"])
+    print(f"Wrote recommendations for {len(points)} points to {output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Vectorized crop scoring with NumPy.
+
+The fitness in plant_core.plant_fitness is exp(-sum(c_i * (x_i - opt_i)**2)) with
+c_i = w_i / (2 * sigma_i**2). Here every crop becomes one row of an optima
+matrix and every sensor reading one row of a sensor matrix, so whole batches
+are scored with a few array operations instead of a Python loop per crop.
+"""
+import numpy as np
+
+SENSOR_KEYS = ['T', 'H', 'P', 'T_avg', 'AP', 'pH']
+SIGMA_KEYS = ['sigma_T', 'sigma_H', 'sigma_P', 'sigma_Tavg', 'sigma_AP', 'sigma_pH']
+WEIGHT_KEYS = ['w_T', 'w_H', 'w_P', 'w_Tavg', 'w_AP', 'w_pH']
+P_OPT = 1013
+
+# Upper bound on (sensor rows x crops) cells held in memory at once
+DEFAULT_MAX_CELLS = 2_000_000
+
+### Array Construction
+def build_profile_arrays(optimal_conditions):
+    """Return (crop_names, optima) with one optima row per crop in SENSOR_KEYS order."""
+    crops = list(optimal_conditions)
+    optima = np.empty((len(crops), len(SENSOR_KEYS)), dtype=np.float64)
+    for i, crop in enumerate(crops):
+        opt = optimal_conditions[crop]
+        optima[i] = (opt['T_opt'], opt['H_opt'], P_OPT, opt['T_opt'], opt['AP_opt'], opt['pH_opt'])
+    return crops, optima
+
+def score_coefficients(sigmas, weights):
+    sigma = np.array([sigmas[k] for k in SIGMA_KEYS], dtype=np.float64)
+    weight = np.array([weights[k] for k in WEIGHT_KEYS], dtype=np.float64)
+    return weight / (2 * sigma ** 2)
+
+def sensor_vector(sensor_data):
+    return np.array([sensor_data[k] for k in SENSOR_KEYS], dtype=np.float64)
+
+### Scoring
+def exponent_matrix(sensors, optima, coef):
+    """Weighted squared distances, shape (len(sensors), len(optima)).
+
+    Expanded as |x|^2 - 2 x.opt + |opt|^2 in the coefficient-scaled space so the
+    crop dimension is handled by one matrix product. Both sides are centred on
+    the mean of the finite optima rows first to keep the expansion numerically
+    stable. A profile with a missing (NaN) optimum gets an infinite exponent,
+    i.e. zero fitness, without affecting the other crops.
+    """
+    sensors = np.atleast_2d(sensors)
+    finite = np.isfinite(optima).all(axis=1)
+    centre = optima[finite].mean(axis=0) if finite.any() else 0.0
+    xs = sensors - centre
+    os_ = optima - centre
+    exponent = (xs ** 2) @ coef
+    exponent = exponent[:, None] + ((os_ ** 2) @ coef)[None, :]
+    exponent -= 2.0 * (xs * coef) @ os_.T
+    exponent[np.isnan(exponent)] = np.inf
+    np.maximum(exponent, 0.0, out=exponent)
+    return exponent
+
+def fitness_matrix(sensors, optima, coef):
+    return np.exp(-exponent_matrix(sensors, optima, coef))
+
+def _rows_per_chunk(n_crops, max_cells):
+    return max(1, max_cells // max(1, n_crops))
+
+### Sensitivity / What-if Sweeps
+def sensitivity_sweep(sensor_data, optimal_conditions, sigmas, weights, ranges, max_cells=DEFAULT_MAX_CELLS):
+    """Score every combination of sensor perturbations against every crop.
+
+    ranges maps sensor keys ('T', 'H', 'P', 'T_avg', 'AP', 'pH') to sequences of
+    offsets added to the base reading, e.g. {'T': [-2, 0, 2], 'pH': [-0.5, 0]}.
+    Keys that are left out stay at their base value. The grid is evaluated in
+    chunks of at most max_cells (grid points x crops) so memory stays bounded.
+
+    Returns the baseline winner, how often it still wins across the grid, and
+    per-crop win share, fitness range and margin over the best other crop.
+    """
+    unknown = set(ranges) - set(SENSOR_KEYS)
+    if unknown:
+        raise KeyError(f"Unknown sensor keys in ranges: {sorted(unknown)}")
+    crops, optima = build_profile_arrays(optimal_conditions)
+    if not crops:
+        raise ValueError("No crop profiles to score.")
+    coef = score_coefficients(sigmas, weights)
+    base = sensor_vector(sensor_data)
+    axes = [np.asarray(ranges.get(k, [0.0]), dtype=np.float64).ravel() for k in SENSOR_KEYS]
+    if any(len(axis) == 0 for axis in axes):
+        raise ValueError("Every sensor range needs at least one offset.")
+    shape = tuple(len(axis) for axis in axes)
+    grid_size = int(np.prod(shape))
+    n_crops = len(crops)
+
+    baseline_fitness = fitness_matrix(base, optima, coef)[0]
+    baseline_idx = int(np.argmax(baseline_fitness))
+
+    wins = np.zeros(n_crops, dtype=np.int64)
+    fit_min = np.full(n_crops, np.inf)
+    fit_max = np.full(n_crops, -np.inf)
+    fit_sum = np.zeros(n_crops)
+    margin_min = np.full(n_crops, np.inf)
+    margin_max = np.full(n_crops, -np.inf)
+
+    step = _rows_per_chunk(n_crops, max_cells)
+    for start in range(0, grid_size, step):
+        flat = np.arange(start, min(start + step, grid_size))
+        idx = np.unravel_index(flat, shape)
+        sensors = base + np.column_stack([axes[j][idx[j]] for j in range(len(SENSOR_KEYS))])
+        fitness = fitness_matrix(sensors, optima, coef)
+
+        winner = np.argmax(fitness, axis=1)
+        wins += np.bincount(winner, minlength=n_crops)
+        fit_min = np.minimum(fit_min, fitness.min(axis=0))
+        fit_max = np.maximum(fit_max, fitness.max(axis=0))
+        fit_sum += fitness.sum(axis=0)
+
+        rows = np.arange(len(flat))
+        best = fitness[rows, winner]
+        if n_crops > 1:
+            masked = fitness.copy()
+            masked[rows, winner] = -np.inf
+            second = masked.max(axis=1)
+        else:
+            second = np.zeros(len(flat))
+        # Margin of each crop over the best *other* crop at every grid point
+        other = np.where(np.arange(n_crops)[None, :] == winner[:, None], second[:, None], best[:, None])
+        margin = fitness - other
+        margin_min = np.minimum(margin_min, margin.min(axis=0))
+        margin_max = np.maximum(margin_max, margin.max(axis=0))
+
+    per_crop = {
+        crop: {
+            "win_share": float(wins[i] / grid_size),
+            "min_fitness": float(fit_min[i]),
+            "mean_fitness": float(fit_sum[i] / grid_size),
+            "max_fitness": float(fit_max[i]),
+            "min_margin": float(margin_min[i]),
+            "max_margin": float(margin_max[i]),
+        }
+        for i, crop in enumerate(crops)
+    }
+    return {
+        "baseline_crop": crops[baseline_idx],
+        "baseline_fitness": float(baseline_fitness[baseline_idx]),
+        "grid_size": grid_size,
+        "stability": float(wins[baseline_idx] / grid_size),
+        "crops": per_crop,
+    }
+
+def sweep_offsets(**ranges):
+    """Convenience for symmetric ranges: sweep_offsets(T=(2, 0.5)) -> T offsets -2..2 step 0.5."""
+    offsets = {}
+    for key, (span, step) in ranges.items():
+        n = int(round(span / step))
+        offsets[key] = np.linspace(-span, span, 2 * n + 1)
+    return offsets
+
+### Top-k Ranking
+def top_k(sensors, optima, coef, k=5, crop_block=65536):
+    """Best k crops for every sensor row, as (indices, fitness) arrays of shape (rows, k).
+
+    Crops are scored crop_block at a time and merged into a running top-k, so a
+    catalog of millions of profiles never needs a full (rows x crops) matrix.
+    Results are sorted best first.
+    """
+    sensors = np.atleast_2d(np.asarray(sensors, dtype=np.float64))
+    rows, n_crops = len(sensors), len(optima)
+    k = min(k, n_crops)
+    # The running top-k starts empty rather than padded, so zero-fitness crops are
+    # still returned ahead of placeholders when fewer than k crops score above zero.
+    best_exp = np.empty((rows, 0))
+    best_idx = np.empty((rows, 0), dtype=np.int64)
+    if k == 0:
+        return best_idx, np.exp(-best_exp)
+    for start in range(0, n_crops, crop_block):
+        block_exp = exponent_matrix(sensors, optima[start:start + crop_block], coef)
+        block_idx = np.broadcast_to(np.arange(start, start + block_exp.shape[1]), block_exp.shape)
+        best_exp = np.concatenate([best_exp, block_exp], axis=1)
+        best_idx = np.concatenate([best_idx, block_idx], axis=1)
+        if best_exp.shape[1] > k:
+            keep = np.argpartition(best_exp, k - 1, axis=1)[:, :k]
+            best_exp = np.take_along_axis(best_exp, keep, axis=1)
+            best_idx = np.take_along_axis(best_idx, keep, axis=1)
+    order = np.argsort(best_exp, axis=1, kind="stable")
+    best_idx = np.take_along_axis(best_idx, order, axis=1)
+    best_exp = np.take_along_axis(best_exp, order, axis=1)
+    return best_idx, np.exp(-best_exp)
+
+### Season Planning
+def season_top_crops(month_sensors, optima, coef, k=10, crop_block=65536):
+    """Top k crops by peak fitness over a (months x 6) sensor matrix.
+
+    Every month is scored against every crop, crop_block crops at a time, and a
+    running top-k on each crop's best month is kept. Returns (indices, fitness)
+    with fitness of shape (months, k), columns sorted by peak fitness.
+    """
+    month_sensors = np.atleast_2d(np.asarray(month_sensors, dtype=np.float64))
+    n_crops = len(optima)
+    k = min(k, n_crops)
+    best_exp = np.empty(0)
+    best_idx = np.empty(0, dtype=np.int64)
+    for start in range(0, n_crops, crop_block):
+        peak_exp = exponent_matrix(month_sensors, optima[start:start + crop_block], coef).min(axis=0)
+        best_exp = np.concatenate([best_exp, peak_exp])
+        best_idx = np.concatenate([best_idx, np.arange(start, start + len(peak_exp))])
+        if len(best_exp) > k:
+            keep = np.argpartition(best_exp, k - 1)[:k] if k else np.empty(0, dtype=np.int64)
+            best_exp, best_idx = best_exp[keep], best_idx[keep]
+    best_idx = best_idx[np.argsort(best_exp, kind="stable")]
+    return best_idx, fitness_matrix(month_sensors, optima[best_idx], coef)
+
+def planting_windows(month_fitness, ratio=0.8):
+    """Runs of consecutive months whose fitness is within ratio of the peak.
+
+    month_fitness holds one crop's fitness per month, January first. Returns
+    (first_month, last_month, mean_fitness) tuples with 1-based months, best
+    window first. Windows may wrap over the new year, e.g. (11, 2, ...).
+    """
+    month_fitness = np.asarray(month_fitness, dtype=np.float64)
+    months = len(month_fitness)
+    good = month_fitness >= ratio * month_fitness.max()
+    if good.all():
+        return [(1, months, float(month_fitness.mean()))]
+    # Rotate so the year starts right after a bad month; then no run wraps around
+    shift = int(np.argmin(good)) + 1
+    rolled = np.roll(good, -shift).astype(np.int8)
+    edges = np.diff(np.concatenate([[0], rolled, [0]]))
+    windows = []
+    for run_start, run_stop in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+        members = (np.arange(run_start, run_stop) + shift) % months
+        windows.append((int(members[0]) + 1, int(members[-1]) + 1, float(month_fitness[members].mean())))
+    return sorted(windows, key=lambda window: window[2], reverse=True)
@@ -0,0 +1,166 @@
+"""Memory footprint of each data-pipeline stage at several dataset sizes.
+
+For every size a synthetic Plant Database folder is written to a temp dir and
+the real pipeline functions from crop_data.py are run stage by stage:
+loading, export_plant_counts, compute_optimal_conditions and scoring (the
+engine building its profile arrays and CropIndex, then one top-n query), then
+the same stages again through the memory-mapped plant store, and the
+chunked streaming aggregation straight from the CSVs. Each
+stage reports its tracemalloc peak, the Python memory it leaves allocated, and
+the peak process RSS sampled while it runs.
+
+Usage: python benchmarks/bench_memory.py [--rows 10000 100000 ...] [--files N]
+                                         [--budget-mb MB] [--budget STAGE=MB ...]
+Exits with status 1 when a stage's tracemalloc peak exceeds its budget.
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import numpy as np
+import pandas as pd
+
+import crop_data
+import plant_store
+from engine import RecommendationEngine
+
+STAGES = ["load", "plant_counts", "optimal_conditions", "scoring",
+          "store_load", "store_plant_counts", "store_optimal_conditions", "streaming_optimal_conditions"]
+SENSOR = {'T': 22.0, 'H': 60.0, 'P': 1005.0, 'T_avg': 21.0, 'AP': 120.0, 'pH': 6.4}
+
+def write_dataset(folder, rows, files, crops, seed=0):
+    rng = np.random.default_rng(seed)
+    per_file = rows // files
+    for i in range(files):
+        n = per_file + (rows % files if i == files - 1 else 0)
+        pd.DataFrame({
+            "label": rng.choice([f"crop_{c}" for c in range(crops)], n),
+            "Temperature": rng.uniform(10, 35, n),
+            "Humidity": rng.uniform(20, 95, n),
+            "pH": rng.uniform(4.5, 8.5, n),
+            "Rainfall": rng.uniform(20, 300, n),
+            "N": rng.integers(0, 140, n),
+            "P": rng.integers(5, 145, n),
+            "K": rng.integers(5, 205, n),
+        }).to_csv(os.path.join(folder, f"part_{i}.csv"), index=False)
+
+### RSS Sampling
+def read_rss():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+class RSSSampler:
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = None
+        self._stop = threading.Event()
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss = read_rss()
+            if rss is not None:
+                self.peak = rss if self.peak is None else max(self.peak, rss)
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+def measure(fn):
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    with RSSSampler() as sampler:
+        result = fn()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, {"peak": peak - before, "retained": current - before, "rss_peak": sampler.peak}
+
+def score(engine):
+    engine._build_scoring_arrays()
+    return engine.index.query(SENSOR, k=engine.top_n)
+
+def run_size(rows, files, crops):
+    stats = {}
+    with tempfile.TemporaryDirectory() as folder:
+        write_dataset(folder, rows, files, crops)
+        df, stats["load"] = measure(lambda: crop_data.load_local_crop_datasets(folder))
+        _, stats["plant_counts"] = measure(lambda: crop_data.export_plant_counts(df, folder))
+        optimal, stats["optimal_conditions"] = measure(lambda: crop_data.compute_optimal_conditions(df))
+        engine = RecommendationEngine(folder_path=folder, profile_cache_path=os.path.join(folder, "profile_cache.json"))
+        engine.optimal_conditions = optimal
+        _, stats["scoring"] = measure(lambda: score(engine))
+        del df
+        # The one-time columnar conversion is not measured; opening and reading it is
+        plant_store.build_plant_store(folder)
+        store, stats["store_load"] = measure(lambda: crop_data.load_crop_data(folder))
+        _, stats["store_plant_counts"] = measure(lambda: crop_data.export_plant_counts(store, folder))
+        _, stats["store_optimal_conditions"] = measure(lambda: crop_data.compute_optimal_conditions(store))
+        _, stats["streaming_optimal_conditions"] = measure(
+            lambda: crop_data.compute_optimal_conditions_streaming(folder, chunksize=50_000))
+    return stats
+
+def mb(value):
+    return "n/a" if value is None else f"{value / 2**20:.1f}"
+
+def parse_budgets(args):
+    budgets = {stage: args.budget_mb for stage in STAGES}
+    for item in args.budget:
+        stage, _, limit = item.partition("=")
+        if stage not in STAGES:
+            raise SystemExit(f"Unknown stage {stage!r}; choose from {', '.join(STAGES)}")
+        budgets[stage] = float(limit)
+    return budgets
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--crops", type=int, default=200)
+    parser.add_argument("--budget-mb", type=float, default=None,
+                        help="default tracemalloc peak budget for every stage")
+    parser.add_argument("--budget", action="append", default=[], metavar="STAGE=MB",
+                        help="per-stage budget, e.g. load=256 (overrides --budget-mb)")
+    args = parser.parse_args()
+    budgets = parse_budgets(args)
+
+    failures = []
+    print(f"{'rows':>10} {'stage':<30} {'peak MB':>9} {'retained MB':>12} {'RSS peak MB':>12}")
+    for rows in args.rows:
+        stats = run_size(rows, args.files, args.crops)
+        for stage in STAGES:
+            s = stats[stage]
+            print(f"{rows:>10} {stage:<30} {mb(s['peak']):>9} {mb(s['retained']):>12} {mb(s['rss_peak']):>12}")
+            budget = budgets[stage]
+            if budget is not None and s["peak"] > budget * 2**20:
+                failures.append(f"{stage} at {rows} rows: {mb(s['peak'])} MB > {budget} MB")
+    if failures:
+        print("Memory budget exceeded:")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
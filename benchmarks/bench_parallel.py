@@ -0,0 +1,48 @@
+"""Throughput of parallel_scoring.parallel_top_k as the worker count grows.
+
+Usage: python benchmarks/bench_parallel.py [--crops N] [--locations M] [--max-procs P]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from batch_scoring import score_coefficients
+from engine import DEFAULT_SIGMAS, DEFAULT_WEIGHTS
+from parallel_scoring import parallel_top_k
+
+LOW = [10, 20, 990, 10, 20, 5]
+HIGH = [35, 90, 1030, 35, 300, 8]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--crops", type=int, default=1_000_000)
+    parser.add_argument("--locations", type=int, default=2_000)
+    parser.add_argument("--max-procs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    optima = rng.uniform(LOW, HIGH, (args.crops, 6))
+    sensors = rng.uniform(LOW, HIGH, (args.locations, 6))
+    coef = score_coefficients(DEFAULT_SIGMAS, DEFAULT_WEIGHTS)
+
+    print(f"{args.crops} profiles x {args.locations} locations, top-{args.k}")
+    print(f"{'procs':>5} {'seconds':>10} {'locations/s':>12} {'speedup':>8}")
+    baseline = None
+    procs = 1
+    while procs <= args.max_procs:
+        start = time.perf_counter()
+        parallel_top_k(sensors, optima, coef, k=args.k, processes=procs)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{procs:>5} {elapsed:>10.2f} {args.locations / elapsed:>12.0f} {baseline / elapsed:>8.2f}")
+        procs *= 2
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""Import-time benchmark for the entry points.
+
+Each target is imported in a fresh interpreter so module caches never hide a
+regression. Heavy third-party modules are timed too, for reference.
+
+Usage: python benchmarks/bench_startup.py [--repeat N] [--budget SECONDS]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, python snippet that performs the import)
+ENTRY_POINTS = [
+    ("plant_core", "import plant_core"),
+    ("quick_score", "import quick_score"),
+    ("Full-No GUI.py", "import importlib.util as u; s = u.spec_from_file_location('cli', 'Full-No GUI.py'); s.loader.exec_module(u.module_from_spec(s))"),
+    ("Full.py", "import importlib.util as u; s = u.spec_from_file_location('gui', 'Full.py'); s.loader.exec_module(u.module_from_spec(s))"),
+]
+REFERENCE_MODULES = ["pandas", "numpy", "requests", "PIL.Image", "tkinter"]
+
+TIMER = "import time; _t = time.perf_counter(); {snippet}; print(time.perf_counter() - _t)"
+
+def time_import(snippet, repeat):
+    samples = []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-c", TIMER.format(snippet=snippet)],
+                              cwd=REPO_DIR, capture_output=True, text=True)
+        if proc.returncode != 0:
+            return None
+        samples.append(float(proc.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=None,
+                        help="fail if any entry point takes longer than this many seconds to import")
+    args = parser.parse_args()
+
+    over_budget = []
+    print(f"{'target':<20} {'median import (ms)':>20}")
+    for label, snippet in ENTRY_POINTS:
+        seconds = time_import(snippet, args.repeat)
+        if seconds is None:
+            print(f"{label:<20} {'import failed':>20}")
+            over_budget.append(label)
+            continue
+        print(f"{label:<20} {seconds * 1000:>20.1f}")
+        if args.budget is not None and seconds > args.budget:
+            over_budget.append(label)
+    print("--- reference (not budgeted) ---")
+    for module in REFERENCE_MODULES:
+        seconds = time_import(f"import {module}", args.repeat)
+        shown = "not installed" if seconds is None else f"{seconds * 1000:.1f}"
+        print(f"{module:<20} {shown:>20}")
+
+    if over_budget:
+        print(f"Startup budget exceeded by: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
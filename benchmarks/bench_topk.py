@@ -0,0 +1,59 @@
+"""Top-k query latency: CropIndex (KD-tree) versus the exhaustive blocked scan.
+
+Usage: python benchmarks/bench_topk.py [--crops 10000 100000 ...] [--queries M] [--k K] [--missing F]
+
+A fraction F of the profiles gets a NaN pH optimum, as crops from a CSV without
+a pH column do. Exits non-zero if the index and the scan ever disagree.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from batch_scoring import P_OPT, score_coefficients, top_k
+from crop_index import CropIndex, cKDTree
+from engine import DEFAULT_SIGMAS, DEFAULT_WEIGHTS
+
+def synthetic_optima(rng, n, missing=0.0):
+    t, h, ap, ph = rng.uniform([10, 20, 20, 5], [35, 95, 300, 8], (n, 4)).T
+    ph[rng.random(n) < missing] = np.nan
+    return np.column_stack([t, h, np.full(n, P_OPT), t, ap, ph])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--crops", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--missing", type=float, default=0.01, help="fraction of profiles without a pH optimum")
+    args = parser.parse_args()
+    if cKDTree is None:
+        print("scipy is not installed; CropIndex falls back to the exhaustive scan.")
+
+    rng = np.random.default_rng(0)
+    coef = score_coefficients(DEFAULT_SIGMAS, DEFAULT_WEIGHTS)
+    sensors = rng.uniform([10, 20, 990, 10, 20, 5], [35, 95, 1030, 35, 300, 8], (args.queries, 6))
+    all_exact = True
+    print(f"{'crops':>9} {'build s':>8} {'index us/q':>11} {'scan us/q':>10} {'exact':>6}")
+    for n in args.crops:
+        optima = synthetic_optima(rng, n, args.missing)
+        start = time.perf_counter()
+        index = CropIndex(range(n), optima, coef)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        idx, fitness = index.query_batch(sensors, args.k)
+        indexed = time.perf_counter() - start
+        start = time.perf_counter()
+        ref_idx, ref_fitness = top_k(sensors, optima, coef, args.k)
+        scanned = time.perf_counter() - start
+        exact = np.allclose(fitness, ref_fitness, rtol=0, atol=1e-12)
+        all_exact = all_exact and exact
+        print(f"{n:>9} {build:>8.2f} {indexed / args.queries * 1e6:>11.1f} "
+              f"{scanned / args.queries * 1e6:>10.1f} {str(exact):>6}")
+    return 0 if all_exact else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
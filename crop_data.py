@@ -0,0 +1,169 @@
+"""Plant Database loading and per-crop optimum computation.
+
+Besides raw DataFrames, every function here also accepts a plant_store.PlantStore.
+That is the memory-mapped columnar copy of the database that load_crop_data
+prefers.
+"""
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import repeat
+
+PLANT_DB_FOLDER = '/Users/michael_z/Downloads/Plant Database'
+GROUP_COLUMNS = ['label', 'crop', 'common_name', 'plant_name']
+# Profile key -> dataset column averaged per crop
+FEATURE_COLUMNS = {'T_opt': 'Temperature', 'H_opt': 'Humidity', 'pH_opt': 'pH', 'AP_opt': 'Rainfall'}
+STREAM_CHUNKSIZE = 200_000
+
+def _is_store(data):
+    return hasattr(data, "offsets")
+
+def find_group_col(df):
+    if _is_store(df):
+        return df.group_col
+    group_col = next((col for col in GROUP_COLUMNS if col in df.columns), None)
+    if not group_col:
+        raise KeyError(f"No suitable column found in {list(df.columns)}")
+    return group_col
+
+def load_local_crop_datasets(folder_path):
+    import pandas as pd
+    csv_files = glob.glob(os.path.join(folder_path, '*.csv'))
+    if not csv_files:
+        print(f"No CSV files found in {folder_path}")
+        return None
+    dfs = [df for df in (pd.read_csv(file) for file in csv_files) if not df.empty]
+    if not dfs:
+        return None
+    df_combined = pd.concat(dfs, ignore_index=True)
+    print(f"Combined DataFrame shape: {df_combined.shape}")
+    return df_combined
+
+def load_crop_data(folder_path, use_store=True):
+    """The Plant Database as a memory-mapped PlantStore, or a DataFrame if use_store is off.
+
+    The store is built on first use and rebuilt whenever the CSVs change.
+    """
+    if use_store:
+        from plant_store import load_plant_store
+        store = load_plant_store(folder_path)
+        if store is not None:
+            return store
+    return load_local_crop_datasets(folder_path)
+
+def export_plant_counts(df, folder_path):
+    total_plants = len(df)
+    if _is_store(df):
+        # Rows are stored per crop, so counts come straight from the offsets
+        counts = dict(sorted(df.counts().items(), key=lambda item: item[1], reverse=True))
+    else:
+        counts = df[find_group_col(df)].value_counts().to_dict()
+    output_file = os.path.join(folder_path, "plant_count.txt")
+    with open(output_file, "w") as f:
+        f.write(f"Total number of plant rows: {total_plants}\n")
+        f.write("Counts per crop:\n")
+        for crop, count in counts.items():
+            f.write(f"{crop}: {count}\n")
+    print(f"Plant counts exported to {output_file}")
+
+def compute_optimal_conditions(df):
+    if _is_store(df):
+        return _store_optimal_conditions(df)
+    group_col = find_group_col(df)
+    groups = df.groupby(group_col)
+    optimal = {
+        crop: {key: group[column].mean() for key, column in FEATURE_COLUMNS.items()}
+        for crop, group in groups
+    }
+    return optimal
+
+def _store_optimal_conditions(store):
+    if not store.labels:
+        return {}
+    means = {key: store.segment_means(column) for key, column in FEATURE_COLUMNS.items()}
+    return {crop: {key: float(values[i]) for key, values in means.items()}
+            for i, crop in enumerate(store.labels)}
+
+### Streaming Aggregation
+def _read_header(filepath):
+    import pandas as pd
+    try:
+        return list(pd.read_csv(filepath, nrows=0).columns)
+    except (OSError, ValueError) as e:  # pandas' EmptyDataError is a ValueError
+        print(f"Skipping {filepath}: {e}")
+        return []
+
+def _empty_sums():
+    import pandas as pd
+    columns = pd.MultiIndex.from_product([["count", "sum", "sumsq"], list(FEATURE_COLUMNS.values())])
+    return pd.DataFrame(columns=columns, dtype="float64")
+
+def partial_sums(filepath, group_col, chunksize=STREAM_CHUNKSIZE):
+    """Per-crop count, sum and sum of squares of each feature for one CSV, read in chunks.
+
+    Memory is bounded by chunksize rows plus one row per crop. Features that are
+    missing from the file count as missing values, as they would after a concat.
+    """
+    import pandas as pd
+    header = _read_header(filepath)
+    if group_col not in header:
+        return _empty_sums()
+    features = [col for col in FEATURE_COLUMNS.values() if col in header]
+    totals = _empty_sums()
+    for chunk in pd.read_csv(filepath, usecols=[group_col] + features, chunksize=chunksize):
+        values = chunk[features]
+        labels = chunk[group_col]
+        sums = pd.concat({
+            "count": values.groupby(labels).count(),
+            "sum": values.groupby(labels).sum(),
+            "sumsq": (values ** 2).groupby(labels).sum(),
+        }, axis=1).reindex(columns=totals.columns, fill_value=0)
+        totals = sums if totals.empty else totals.add(sums, fill_value=0)
+    return totals
+
+def combine_partial_sums(partials):
+    """Merge partial_sums results from several files or workers."""
+    partials = [p for p in partials if not p.empty]
+    if not partials:
+        return _empty_sums()
+    return reduce(lambda a, b: a.add(b, fill_value=0), partials)
+
+def streaming_crop_statistics(folder_path, chunksize=STREAM_CHUNKSIZE, processes=1):
+    """Per-crop count, mean and sample variance of each feature, without loading whole files.
+
+    Each CSV is streamed in chunks of chunksize rows. With processes > 1 the
+    files are spread across worker processes and their partial sums merged.
+    Returns a DataFrame indexed by crop with ("count" | "mean" | "var", column)
+    columns, or None when the folder has no CSV files.
+    """
+    import pandas as pd
+    csv_files = glob.glob(os.path.join(folder_path, '*.csv'))
+    if not csv_files:
+        print(f"No CSV files found in {folder_path}")
+        return None
+    present = set()
+    for filepath in csv_files:
+        present.update(_read_header(filepath))
+    group_col = next((col for col in GROUP_COLUMNS if col in present), None)
+    if not group_col:
+        raise KeyError(f"No suitable column found in {sorted(present)}")
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            partials = list(pool.map(partial_sums, csv_files, repeat(group_col), repeat(chunksize)))
+    else:
+        partials = [partial_sums(filepath, group_col, chunksize) for filepath in csv_files]
+    totals = combine_partial_sums(partials).sort_index()
+    count = totals["count"]
+    mean = totals["sum"] / count.where(count > 0)
+    var = ((totals["sumsq"] - totals["sum"] * mean) / (count - 1).where(count > 1)).clip(lower=0)
+    return pd.concat({"count": count, "mean": mean, "var": var}, axis=1)
+
+def compute_optimal_conditions_streaming(folder_path, chunksize=STREAM_CHUNKSIZE, processes=1):
+    """Same profiles as compute_optimal_conditions, with memory bounded by the number of crops."""
+    stats = streaming_crop_statistics(folder_path, chunksize, processes)
+    if stats is None:
+        return None
+    mean = stats["mean"]
+    return {crop: {key: float(mean.at[crop, column]) for key, column in FEATURE_COLUMNS.items()}
+            for crop in mean.index}
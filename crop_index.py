@@ -0,0 +1,105 @@
+"""Exact top-k crop lookup through a KD-tree over scaled crop optima.
+
+Multiplying every feature by sqrt(c_i) = sqrt(w_i) / (sigma_i * sqrt(2)) turns
+the fitness exponent into a plain squared Euclidean distance, so ranking crops
+for a reading is a k-nearest-neighbour query. The tree is built once from the
+profiles and answers each query without scanning the whole catalog.
+
+Before indexing, the space is reduced exactly. Columns whose optimum is the
+same for every crop (P_opt) only add a per-reading constant. Columns that share
+an optimum (T and T_avg both compare against T_opt) fold into a single
+weighted-mean dimension. Queries that sit off the data's subspace would
+otherwise defeat the tree's pruning.
+
+Profiles with a missing (NaN) optimum, e.g. crops from a CSV without a pH
+column, are left out of the tree; they have zero fitness for every reading.
+
+scipy is optional: without it the index falls back to the exhaustive blocked
+scan in batch_scoring.top_k, which returns the same results in linear time.
+"""
+import numpy as np
+
+from batch_scoring import build_profile_arrays, score_coefficients, sensor_vector, top_k
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # pragma: no cover - depends on the environment
+    cKDTree = None
+
+class CropIndex:
+    def __init__(self, crops, optima, coef, leafsize=16):
+        self.crops = list(crops)
+        self.optima = np.ascontiguousarray(optima, dtype=np.float64)
+        self.coef = np.asarray(coef, dtype=np.float64)
+        # Rows of optima held in the tree; tree index i is crop self._rows[i]
+        self._rows = np.flatnonzero(np.isfinite(self.optima).all(axis=1))
+        self._fixed, self._groups = self._reduce()
+        self.tree = None
+        if cKDTree is not None and self._groups:
+            finite = self.optima[self._rows]
+            points = np.column_stack([finite[:, cols[0]] * np.sqrt(self.coef[cols].sum())
+                                      for cols in self._groups])
+            self.tree = cKDTree(points, leafsize=leafsize)
+
+    def _reduce(self):
+        """Split columns into fixed (column, value) pairs and groups sharing identical optima."""
+        fixed, groups = [], []
+        optima = self.optima[self._rows]
+        if not len(optima):
+            return fixed, groups
+        for j in range(optima.shape[1]):
+            column = optima[:, j]
+            if self.coef[j] == 0:
+                continue
+            if np.all(column == column[0]):
+                fixed.append((j, column[0]))
+                continue
+            for cols in groups:
+                if np.array_equal(optima[:, cols[0]], column):
+                    cols.append(j)
+                    break
+            else:
+                groups.append([j])
+        return fixed, groups
+
+    def _project(self, sensors):
+        """Map sensor rows into the index space; returns (points, constant exponent per row)."""
+        constant = np.zeros(len(sensors))
+        for j, value in self._fixed:
+            constant += self.coef[j] * (sensors[:, j] - value) ** 2
+        columns = []
+        for cols in self._groups:
+            c = self.coef[cols]
+            total = c.sum()
+            xs = sensors[:, cols]
+            mean = xs @ c / total
+            constant += (xs ** 2) @ c - total * mean ** 2
+            columns.append(mean * np.sqrt(total))
+        return np.column_stack(columns), constant
+
+    @classmethod
+    def from_profiles(cls, optimal_conditions, sigmas, weights, leafsize=16):
+        crops, optima = build_profile_arrays(optimal_conditions)
+        return cls(crops, optima, score_coefficients(sigmas, weights), leafsize=leafsize)
+
+    def __len__(self):
+        return len(self.crops)
+
+    def query_batch(self, sensors, k=5):
+        """(indices, fitness) arrays of shape (rows, k) for a matrix of sensor rows, best first."""
+        sensors = np.atleast_2d(np.asarray(sensors, dtype=np.float64))
+        k = min(k, len(self.crops))
+        # The scan also ranks the zero-fitness profiles when the tree holds fewer than k
+        if self.tree is None or k == 0 or k > len(self._rows):
+            return top_k(sensors, self.optima, self.coef, k)
+        points, constant = self._project(sensors)
+        dist, idx = self.tree.query(points, k=k)
+        dist = dist.reshape(len(sensors), k)
+        idx = self._rows[idx.reshape(len(sensors), k)]
+        exponent = np.maximum(dist ** 2 + constant[:, None], 0.0)
+        return idx, np.exp(-exponent)
+
+    def query(self, sensor_data, k=5):
+        """Top-k [(crop, fitness), ...] for one sensor dict."""
+        idx, fitness = self.query_batch(sensor_vector(sensor_data), k)
+        return [(self.crops[i], float(f)) for i, f in zip(idx[0], fitness[0])]
@@ -0,0 +1,360 @@
+"""RecommendationEngine: the recommendation pipeline shared by every front end.
+
+Full.py, Full-No GUI.py and batch_recommend.py all drive one engine. It owns
+the loaded Plant Database, the crop profiles, the scoring arrays and index, the
+report caches and the scoring configuration. It is built once, warmed up
+explicitly or on first use, and then reused for every request until refresh()
+reloads the data.
+"""
+import time
+
+from crop_data import PLANT_DB_FOLDER, load_crop_data, export_plant_counts, compute_optimal_conditions
+from plant_core import get_sensor_data_from_report, report_is_complete, export_profile_cache, PROFILE_CACHE_PATH
+from providers import (get_location_info, get_location_info_batch, get_location_info_within, get_season_climate,
+                       get_soil_data)
+from report_store import (open_report_store, find_report, nearest_reports, save_report, save_recommendation,
+                          REPORT_DB_PATH, REPORT_MAX_AGE_HOURS)
+
+PROMPTS = {
+    'T': "Enter instantaneous temperature (°C): ",
+    'H': "Enter ambient humidity (%): ",
+    'P': "Enter atmospheric pressure (hPa): ",
+    'T_avg': "Enter monthly average temperature (°C): ",
+    'AP': "Enter total precipitation (mm): ",
+    'pH': "Enter soil pH: "
+}
+VALID_RANGES = {
+    'T': (-50, 60),
+    'H': (0, 100),
+    'P': (900, 1100),
+    'T_avg': (-50, 60),
+    'AP': (0, 1000),
+    'pH': (0, 14)
+}
+DEFAULT_SIGMAS = {
+    'sigma_T': 2.0,
+    'sigma_H': 10.0,
+    'sigma_P': 10.0,
+    'sigma_Tavg': 2.0,
+    'sigma_AP': 20.0,
+    'sigma_pH': 0.5
+}
+# Last-resort values for deadline-bounded runs when neither live data nor any
+# stored report supplies a field; mid-range placeholders, tune for your region.
+DEFAULT_SENSOR_VALUES = {
+    'T': 20.0,
+    'H': 60.0,
+    'P': 1013.0,
+    'T_avg': 20.0,
+    'AP': 80.0,
+    'pH': 6.5
+}
+DEFAULT_WEIGHTS = {
+    'w_T': 0.35,
+    'w_H': 0.30,
+    'w_P': 0.05,
+    'w_Tavg': 0.15,
+    'w_AP': 0.10,
+    'w_pH': 0.05
+}
+
+class RecommendationEngine:
+    def __init__(self, folder_path=PLANT_DB_FOLDER, use_store=True, sigmas=None, weights=None, store_path=REPORT_DB_PATH,
+                 report_max_age_hours=REPORT_MAX_AGE_HOURS, top_n=25, profile_cache_path=PROFILE_CACHE_PATH,
+                 sensor_defaults=None, nearest_radius=1.0):
+        self.folder_path = folder_path
+        self.use_store = use_store
+        self.sensor_defaults = dict(DEFAULT_SENSOR_VALUES if sensor_defaults is None else sensor_defaults)
+        self.nearest_radius = nearest_radius
+        self.profile_cache_path = profile_cache_path
+        self.sigmas = dict(DEFAULT_SIGMAS if sigmas is None else sigmas)
+        self.weights = dict(DEFAULT_WEIGHTS if weights is None else weights)
+        self.store_path = store_path
+        self.report_max_age_hours = report_max_age_hours
+        self.top_n = top_n
+        self.data = None  # PlantStore (memory-mapped) or DataFrame
+        self.optimal_conditions = None
+        self.crops = None
+        self.optima = None
+        self.coef = None
+        self.index = None
+        self._crop_positions = {}  # crop name -> row in crops/optima
+        self._store = None
+        self._reports = {}  # (lat, lon, month, year) -> (fetched_at, (report_id, report))
+
+    ### Lifecycle
+    @property
+    def ready(self):
+        return self.optimal_conditions is not None
+
+    def warm_up(self):
+        """Load data and build profiles, arrays and index unless that is already done."""
+        return True if self.ready else self.refresh()
+
+    def refresh(self):
+        """Reload the Plant Database from disk and rebuild everything derived from it.
+
+        If the reload finds no data, the previously loaded state stays in use.
+        Cached location reports do not depend on the Plant Database and are kept.
+        """
+        data = load_crop_data(self.folder_path, self.use_store)
+        if data is None:
+            return False
+        self.data = data
+        export_plant_counts(data, self.folder_path)
+        self.optimal_conditions = compute_optimal_conditions(data)
+        self._build_scoring_arrays()
+        return True
+
+    def configure(self, sigmas=None, weights=None):
+        """Change the scoring sigmas/weights; profiles are kept, only the index is rebuilt."""
+        self.sigmas.update(sigmas or {})
+        self.weights.update(weights or {})
+        if self.ready:
+            self._build_scoring_arrays()
+
+    def _build_scoring_arrays(self):
+        from batch_scoring import build_profile_arrays, score_coefficients
+        from crop_index import CropIndex
+        self.crops, self.optima = build_profile_arrays(self.optimal_conditions)
+        self._crop_positions = {crop: i for i, crop in enumerate(self.crops)}
+        self.coef = score_coefficients(self.sigmas, self.weights)
+        self.index = CropIndex(self.crops, self.optima, self.coef)
+        # The JSON cache lets quick_score.py reuse these profiles and settings without pandas
+        export_profile_cache(self.optimal_conditions, self.sigmas, self.weights, self.profile_cache_path)
+
+    def plant_names(self):
+        return sorted(self.optimal_conditions) if self.warm_up() else []
+
+    def crop_rows(self, names):
+        """Rows of crops/optima for the given crop names, in catalog order; unknown names are skipped."""
+        import numpy as np
+        rows = {self._crop_positions[name] for name in names if name in self._crop_positions}
+        return np.array(sorted(rows), dtype=np.int64)
+
+    ### Location Reports
+    @property
+    def store(self):
+        """The report history connection, or None when it cannot be opened.
+
+        Without it, reports are fetched every time and nothing is recorded.
+        """
+        if self._store is None:
+            self._store = open_report_store(self.store_path) or False
+        return self._store or None
+
+    def _save_report(self, lat, lon, month, year, report):
+        return save_report(self.store, lat, lon, month, year, report) if self.store else None
+
+    def get_report(self, lat, lon, month, year):
+        """(report_id, report) from memory, then the report store, then the providers.
+
+        Only reports with every sensor value are reused, so a failed provider is
+        retried on the next run instead of being prompted for until the report expires.
+        report_id is None when there is no report store.
+        """
+        key = (lat, lon, month, year)
+        max_age = self.report_max_age_hours * 3600
+        cached = self._reports.get(key)
+        if cached and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+        stored = None
+        if self.store:
+            stored = find_report(self.store, lat, lon, month, year, max_age_hours=self.report_max_age_hours)
+        if stored and report_is_complete(stored[1]):
+            print(f"Using stored report #{stored[0]} for this location.")
+        else:
+            report = get_location_info(lat, lon, month, year)
+            stored = (self._save_report(lat, lon, month, year, report), report)
+        if report_is_complete(stored[1]):
+            self._reports[key] = (time.monotonic(), stored)
+        return stored
+
+    def get_sensor_data_within(self, lat, lon, month, year, deadline):
+        """Sensor readings for a location within deadline seconds, never prompting.
+
+        Providers run concurrently, and whatever answers in time is used ("live").
+        Each missing field is filled from, in order:
+
+        - a cached report for the same place and month, of any age ("cache")
+        - the nearest stored report for the same month ("nearest")
+        - sensor_defaults ("default")
+
+        Returns (report_id, sensor_data, sources), where sources maps every sensor
+        key to where its value came from. Only complete live reports are stored,
+        so report_id is None when something was late or came back without data.
+        """
+        report, late = get_location_info_within(lat, lon, month, year, deadline)
+        sensor_data = get_sensor_data_from_report(report)
+        sources = {key: "live" for key, value in sensor_data.items() if value is not None}
+        report_id = None
+        if not late and all(value is not None for value in sensor_data.values()):
+            report_id = self._save_report(lat, lon, month, year, report)
+            self._reports[(lat, lon, month, year)] = (time.monotonic(), (report_id, report))
+
+        def fill(candidate, source):
+            values = get_sensor_data_from_report(candidate)
+            for key, value in values.items():
+                if sensor_data[key] is None and value is not None:
+                    sensor_data[key] = value
+                    sources[key] = source
+            return all(value is not None for value in sensor_data.values())
+
+        complete = all(value is not None for value in sensor_data.values())
+        if not complete:
+            cached = self._reports.get((lat, lon, month, year))
+            stored = cached[1] if cached else None
+            if stored is None and self.store:
+                stored = find_report(self.store, lat, lon, month, year)
+            complete = stored is not None and fill(stored[1], "cache")
+        if not complete:
+            neighbours = nearest_reports(self.store, lat, lon, month, radius=self.nearest_radius) if self.store else []
+            for _, _, neighbour in neighbours:
+                if fill(neighbour, "nearest"):
+                    complete = True
+                    break
+        if not complete:
+            for key, value in sensor_data.items():
+                if value is None:
+                    sensor_data[key] = self.sensor_defaults[key]
+                    sources[key] = "default"
+        return report_id, sensor_data, {key: sources[key] for key in sensor_data}
+
+    ### Scoring
+    def recommend(self, sensor_data, selected_plants=None):
+        """Return (best_crop, best_fitness, ranked) with ranked the top_n [(crop, fitness)].
+
+        Returns None when there is no crop data, or none for the selected plants.
+        """
+        if not self.warm_up():
+            return None
+        if selected_plants:
+            # Profiles are computed once for the whole catalog, so a selection only
+            # picks rows out of the optima matrix instead of re-reading dataset rows.
+            import numpy as np
+            from batch_scoring import fitness_matrix, sensor_vector
+            rows = self.crop_rows(selected_plants)
+            if len(rows) == 0:
+                return None
+            fitness = fitness_matrix(sensor_vector(sensor_data), self.optima[rows], self.coef)[0]
+            order = np.argsort(-fitness, kind="stable")[:self.top_n]
+            ranked = [(self.crops[rows[j]], float(fitness[j])) for j in order]
+        else:
+            ranked = self.index.query(sensor_data, k=self.top_n)
+        best_crop, best_fitness = ranked[0]
+        return best_crop, best_fitness, ranked
+
+    def record(self, report_id, mode, result):
+        if self.store is None or report_id is None:
+            return
+        best_crop, best_fitness, ranked = result
+        save_recommendation(self.store, report_id, mode, best_crop, best_fitness, dict(ranked), top_n=self.top_n)
+
+    def recommend_within(self, lat, lon, month, year, deadline, selected_plants=None):
+        """Recommend for a location within a latency budget; see get_sensor_data_within.
+
+        The deadline covers fetching; the cache, store and index lookups that
+        follow take milliseconds. Loading the Plant Database does not fit any
+        deadline, so a cold engine refuses: call warm_up() first. Returns a dict
+        with result, sensor_data, sources and report_id, or None when the engine
+        is not warmed up or there is no crop data.
+        """
+        if not self.ready:
+            print("Error: Call warm_up() before recommend_within().")
+            return None
+        report_id, sensor_data, sources = self.get_sensor_data_within(lat, lon, month, year, deadline)
+        result = self.recommend(sensor_data, selected_plants)
+        if result is None:
+            return None
+        if report_id is not None:
+            self.record(report_id, "selective" if selected_plants else "optimal", result)
+        return {"result": result, "sensor_data": sensor_data, "sources": sources, "report_id": report_id}
+
+    def recommend_many(self, points, month, year, k=5):
+        """Top-k [(crop, fitness)] per (lat, lon), in input order; None where sensor data is missing.
+
+        Reports are fetched with the bulk providers and never prompt; every report
+        and result is appended to the report store.
+        """
+        import numpy as np
+        from batch_scoring import sensor_vector
+        if not self.warm_up():
+            return None
+        points = list(points)
+        results = [None] * len(points)
+        rows, targets = [], []
+        for i, ((lat, lon), report) in enumerate(zip(points, get_location_info_batch(points, month, year))):
+            report_id = self._save_report(lat, lon, month, year, report)
+            sensor_data = get_sensor_data_from_report(report)
+            if any(value is None for value in sensor_data.values()):
+                continue
+            rows.append(sensor_vector(sensor_data))
+            targets.append((i, report_id))
+        if rows:
+            idx, fitness = self.index.query_batch(np.array(rows), k)
+            for (i, report_id), row_idx, row_fit in zip(targets, idx, fitness):
+                ranked = [(self.crops[j], float(f)) for j, f in zip(row_idx, row_fit)]
+                self.record(report_id, "batch", (ranked[0][0], ranked[0][1], ranked))
+                results[i] = ranked
+        return results
+
+    ### Season Planning
+    def plan_season(self, lat, lon, end_year=None, years=1, k=10, ratio=0.8):
+        """Best planting windows for a location from a whole year of monthly climate.
+
+        One request fetches a year, or a years-long normal, of climate data (see
+        providers.get_season_climate). Each month then becomes one sensor row:
+
+        - the monthly mean temperature is used for both T and T_avg
+        - relative humidity is used for H, and surface pressure for P
+        - the monthly total precipitation is used for AP
+        - the soil pH is the same in every month
+
+        All months are scored against every crop in one pass. Gaps are filled
+        from sensor_defaults.
+
+        Returns None when there is no crop data. Otherwise returns a dict with:
+
+        - climate
+        - sensors: one sensor dict per month
+        - defaulted: the months each key was filled in for
+        - crops: the top k crops by peak fitness. Each has its best month, its
+          monthly fitness and its planting windows from batch_scoring.planting_windows.
+        """
+        import numpy as np
+        from batch_scoring import SENSOR_KEYS, season_top_crops, planting_windows
+        if not self.warm_up():
+            return None
+        climate = get_season_climate(lat, lon, end_year, years)
+        ph = get_sensor_data_from_report({"Soil Data (Depth 0-5cm)": get_soil_data(lat, lon)})['pH']
+        monthly = {
+            'T': climate.get("Average Temperature (T2M)"),
+            'H': climate.get("Relative Humidity (RH2M)"),
+            'P': climate.get("Surface Pressure (hPa)"),
+            'T_avg': climate.get("Average Temperature (T2M)"),
+            'AP': climate.get("Total Precipitation (PRECTOT)"),
+            'pH': [ph] * 12
+        }
+        month_sensors = np.empty((12, len(SENSOR_KEYS)))
+        defaulted = {}
+        for j, key in enumerate(SENSOR_KEYS):
+            values = monthly[key] or [None] * 12
+            month_sensors[:, j] = [self.sensor_defaults[key] if value is None else value for value in values]
+            missing = [month for month, value in enumerate(values, start=1) if value is None]
+            if missing:
+                defaulted[key] = missing
+
+        idx, fitness = season_top_crops(month_sensors, self.optima, self.coef, k)
+        crops = []
+        for column, i in enumerate(idx):
+            month_fitness = fitness[:, column]
+            best_month = int(np.argmax(month_fitness))
+            crops.append({
+                "crop": self.crops[i],
+                "best_month": best_month + 1,
+                "best_fitness": float(month_fitness[best_month]),
+                "monthly_fitness": month_fitness.tolist(),
+                "windows": planting_windows(month_fitness, ratio),
+            })
+        sensors = [dict(zip(SENSOR_KEYS, row)) for row in month_sensors.tolist()]
+        return {"climate": climate, "sensors": sensors, "defaulted": defaulted, "crops": crops}
@@ -0,0 +1,72 @@
+"""Multiprocess top-k scoring for very large catalogs and location batches.
+
+The optima matrix is copied into a shared memory block once; pool workers map
+it as a read-only NumPy view, so only the small chunks of sensor rows and their
+top-k results travel between processes. Call from under an
+``if __name__ == "__main__":`` guard, as with any multiprocessing code.
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from batch_scoring import build_profile_arrays, score_coefficients, sensor_vector, top_k
+
+# State each worker sets up once in its initializer
+_worker = {}
+
+def _attach_profiles(shm_name, shape, dtype, coef, crop_block):
+    # Python 3.13+ can skip resource tracking for blocks the parent owns and unlinks
+    kwargs = {"track": False} if sys.version_info >= (3, 13) else {}
+    shm = shared_memory.SharedMemory(name=shm_name, **kwargs)
+    optima = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    optima.flags.writeable = False
+    _worker.update(shm=shm, optima=optima, coef=coef, crop_block=crop_block)
+
+def _score_chunk(task):
+    start, sensors, k = task
+    idx, fitness = top_k(sensors, _worker["optima"], _worker["coef"], k, _worker["crop_block"])
+    return start, idx, fitness
+
+def parallel_top_k(sensors, optima, coef, k=5, processes=None, chunk_rows=256, crop_block=65536):
+    """Same result as batch_scoring.top_k, spread over a process pool.
+
+    sensors is split into chunks of chunk_rows locations; each worker scores its
+    chunk against the shared optima matrix crop_block profiles at a time.
+    """
+    sensors = np.atleast_2d(np.asarray(sensors, dtype=np.float64))
+    optima = np.ascontiguousarray(optima, dtype=np.float64)
+    rows = len(sensors)
+    k = min(k, len(optima))
+    top_idx = np.full((rows, k), -1, dtype=np.int64)
+    top_fit = np.zeros((rows, k))
+    if rows == 0 or k == 0:
+        return top_idx, top_fit
+    processes = processes or os.cpu_count() or 1
+
+    shm = shared_memory.SharedMemory(create=True, size=optima.nbytes)
+    try:
+        shared = np.ndarray(optima.shape, dtype=optima.dtype, buffer=shm.buf)
+        shared[:] = optima
+        del shared
+        tasks = ((start, sensors[start:start + chunk_rows], k) for start in range(0, rows, chunk_rows))
+        with ProcessPoolExecutor(max_workers=processes, initializer=_attach_profiles,
+                                 initargs=(shm.name, optima.shape, optima.dtype.str, coef, crop_block)) as pool:
+            for start, idx, fitness in pool.map(_score_chunk, tasks):
+                top_idx[start:start + len(idx)] = idx
+                top_fit[start:start + len(idx)] = fitness
+    finally:
+        shm.close()
+        shm.unlink()
+    return top_idx, top_fit
+
+def parallel_recommend(sensor_rows, optimal_conditions, sigmas, weights, k=5, processes=None, chunk_rows=256):
+    """Top-k (crop, fitness) pairs for each sensor dict, in input order."""
+    crops, optima = build_profile_arrays(optimal_conditions)
+    coef = score_coefficients(sigmas, weights)
+    sensors = np.array([sensor_vector(s) for s in sensor_rows]).reshape(-1, optima.shape[1])
+    idx, fitness = parallel_top_k(sensors, optima, coef, k=k, processes=processes, chunk_rows=chunk_rows)
+    return [[(crops[i], float(f)) for i, f in zip(row_idx, row_fit)]
+            for row_idx, row_fit in zip(idx, fitness)]
@@ -0,0 +1,116 @@
+"""Lightweight core shared by the front ends.
+
+Only the standard library is imported here, so anything that just needs to
+score a cached report against cached crop profiles can start instantly. The
+heavier modules import pandas, numpy, requests, PIL and tkinter inside the
+functions that use them, for the same reason.
+"""
+import csv
+import json
+from math import exp, isnan
+
+PROFILE_CACHE_PATH = '/Users/michael_z/Downloads/Plant Database/profile_cache.json'
+REPORT_CSV_PATH = '/Users/michael_z/Downloads/location_data_report.csv'
+
+### Report CSV Handling
+def read_report_from_csv(filepath=REPORT_CSV_PATH):
+    report = {}
+    try:
+        with open(filepath, 'r') as csvfile:
+            reader = csv.reader(csvfile)
+            next(reader)  # Skip header
+            for row in reader:
+                section, key, value = row
+                if section not in report:
+                    report[section] = {}
+                if key:
+                    report[section][key] = value if value else None
+                else:
+                    report[section] = value if value else None
+    except FileNotFoundError:
+        print(f"Error: File {filepath} not found.")
+    except Exception as e:
+        print(f"Error reading CSV: {str(e)}")
+    return report
+
+### Crop Recommendation Logic
+def plant_fitness(sensor, optimal, sigmas, weights):
+    T_opt = optimal['T_opt']
+    H_opt = optimal['H_opt']
+    pH_opt = optimal['pH_opt']
+    AP_opt = optimal['AP_opt']
+    P_opt = 1013
+    T_avg_opt = T_opt
+    diff_T = (sensor['T'] - T_opt)**2 / (2 * sigmas['sigma_T']**2)
+    diff_H = (sensor['H'] - H_opt)**2 / (2 * sigmas['sigma_H']**2)
+    diff_P = (sensor['P'] - P_opt)**2 / (2 * sigmas['sigma_P']**2)
+    diff_Tavg = (sensor['T_avg'] - T_avg_opt)**2 / (2 * sigmas['sigma_Tavg']**2)
+    diff_AP = (sensor['AP'] - AP_opt)**2 / (2 * sigmas['sigma_AP']**2)
+    diff_pH = (sensor['pH'] - pH_opt)**2 / (2 * sigmas['sigma_pH']**2)
+    exponent = (weights['w_T'] * diff_T +
+                weights['w_H'] * diff_H +
+                weights['w_P'] * diff_P +
+                weights['w_Tavg'] * diff_Tavg +
+                weights['w_AP'] * diff_AP +
+                weights['w_pH'] * diff_pH)
+    # A profile with a missing (NaN) optimum scores zero, as in batch_scoring
+    if isnan(exponent):
+        return 0.0
+    return exp(-exponent)
+
+def get_sensor_data_from_report(report):
+    sensor_data = {}
+    keys = {
+        'T': ('Weather Data', 'Temperature'),
+        'H': ('Weather Data', 'Humidity'),
+        'P': ('Weather Data', 'Pressure'),
+        'T_avg': ('Climate Data', 'Average Temperature (T2M)'),
+        'AP': ('Climate Data', 'Total Precipitation (PRECTOT)'),
+        'pH': ('Soil Data (Depth 0-5cm)', 'phh2o')
+    }
+    for key, (section, subkey) in keys.items():
+        try:
+            value = report.get(section, {}).get(subkey, None)
+            if isinstance(value, str):
+                value = value.strip()
+            sensor_data[key] = float(value) if value not in (None, "") else None
+        except (ValueError, TypeError, AttributeError):
+            sensor_data[key] = None
+    return sensor_data
+
+def report_is_complete(report):
+    return all(value is not None for value in get_sensor_data_from_report(report).values())
+
+def recommend_crop(sensor_data, optimal_conditions, sigmas, weights):
+    crop_fitness = {crop: plant_fitness(sensor_data, optimal, sigmas, weights)
+                    for crop, optimal in optimal_conditions.items()}
+    best_crop = max(crop_fitness, key=crop_fitness.get)
+    return best_crop, crop_fitness[best_crop], crop_fitness
+
+### Crop Profile Cache
+def export_profile_cache(optimal_conditions, sigmas, weights, filepath=PROFILE_CACHE_PATH):
+    """Save computed crop optima (plus the sigmas/weights used) as plain JSON."""
+    payload = {
+        "sigmas": sigmas,
+        "weights": weights,
+        "profiles": {str(crop): {k: float(v) for k, v in optimal.items()}
+                     for crop, optimal in optimal_conditions.items()}
+    }
+    try:
+        with open(filepath, 'w') as f:
+            json.dump(payload, f)
+        print(f"Crop profiles cached to {filepath}")
+    except Exception as e:
+        print(f"Error writing profile cache: {str(e)}")
+
+def load_profile_cache(filepath=PROFILE_CACHE_PATH):
+    """Return (optimal_conditions, sigmas, weights) or None if there is no usable cache."""
+    try:
+        with open(filepath, 'r') as f:
+            payload = json.load(f)
+        return payload["profiles"], payload["sigmas"], payload["weights"]
+    except FileNotFoundError:
+        print(f"Error: Profile cache {filepath} not found.")
+    except (ValueError, KeyError) as e:
+        print(f"Error reading profile cache: {str(e)}")
+    return None
@@ -0,0 +1,162 @@
+"""Compact memory-mapped columnar copy of the Plant Database.
+
+The raw CSVs are converted once into a directory of .npy files:
+
+- labels.json: the distinct crop names, sorted (dictionary encoding)
+- codes.npy: each row's crop code; rows are sorted so each crop is contiguous
+- offsets.npy: row offsets per crop, so crop i spans offsets[i]:offsets[i + 1]
+- <column>.npy: every numeric column as float32
+- meta.json: group column, column names and source file fingerprints
+
+Opening the store maps the arrays with np.load(mmap_mode='r'), so loading is
+near zero-copy and only the pages that are actually read come into memory.
+Per-crop counts are just np.diff(offsets). A rebuild writes a fresh directory
+and swaps it in, so files that another process has mapped are never rewritten.
+"""
+import glob
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+STORE_DIRNAME = '.plant_store'
+STORE_VERSION = 1
+
+def default_store_dir(folder_path):
+    return os.path.join(folder_path, STORE_DIRNAME)
+
+def _source_fingerprint(folder_path):
+    files = sorted(glob.glob(os.path.join(folder_path, '*.csv')))
+    return [[os.path.basename(f), os.stat(f).st_size, os.stat(f).st_mtime_ns] for f in files]
+
+def _column_file(store_dir, column):
+    # Column names come from CSV headers; keep file names filesystem-safe
+    safe = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in column)
+    return os.path.join(store_dir, f"col_{safe}.npy")
+
+class PlantStore:
+    def __init__(self, store_dir, group_col, labels, codes, offsets, columns):
+        self.store_dir = store_dir
+        self.group_col = group_col
+        self.labels = labels
+        self.codes = codes
+        self.offsets = offsets
+        self.columns = columns  # name -> float32 array (memory-mapped when opened from disk)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def counts(self):
+        return dict(zip(self.labels, np.diff(self.offsets).tolist()))
+
+    def rows(self, crop):
+        """Row slice for one crop; crops are stored contiguously."""
+        i = self.labels.index(crop)
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def segment_means(self, column):
+        """NaN-skipping mean of a column for every crop, in label order (float64)."""
+        values = self.columns[column]
+        starts = self.offsets[:-1]
+        valid = ~np.isnan(values)
+        sums = np.add.reduceat(np.where(valid, values, 0), starts, dtype=np.float64)
+        counts = np.add.reduceat(valid, starts, dtype=np.int64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sums / counts
+
+### Building and Opening
+def build_plant_store(folder_path, store_dir=None):
+    """Convert the Plant Database CSVs into the columnar store; returns the opened store or None."""
+    import pandas as pd
+    from crop_data import load_local_crop_datasets, find_group_col
+    store_dir = store_dir or default_store_dir(folder_path)
+    fingerprint = _source_fingerprint(folder_path)
+    df = load_local_crop_datasets(folder_path)
+    if df is None:
+        return None
+    group_col = find_group_col(df)
+    codes, uniques = pd.factorize(df[group_col], sort=True)
+    present = codes >= 0  # rows without a crop label are dropped, as groupby would
+    order = np.argsort(codes[present], kind="stable")
+    rows = np.flatnonzero(present)[order]
+    sorted_codes = codes[rows]
+    offsets = np.searchsorted(sorted_codes, np.arange(len(uniques) + 1)).astype(np.int64)
+    code_dtype = np.uint16 if len(uniques) < 2 ** 16 else np.uint32
+
+    numeric = [col for col in df.columns if col != group_col and pd.api.types.is_numeric_dtype(df[col])]
+    parent = os.path.dirname(os.path.abspath(store_dir))
+    build_dir = tempfile.mkdtemp(prefix=STORE_DIRNAME + ".build-", dir=parent)
+    try:
+        np.save(os.path.join(build_dir, "codes.npy"), sorted_codes.astype(code_dtype))
+        np.save(os.path.join(build_dir, "offsets.npy"), offsets)
+        for col in numeric:
+            np.save(_column_file(build_dir, col), df[col].to_numpy(dtype=np.float32, na_value=np.nan)[rows])
+        with open(os.path.join(build_dir, "labels.json"), "w") as f:
+            json.dump([str(label) for label in uniques], f)
+        with open(os.path.join(build_dir, "meta.json"), "w") as f:
+            json.dump({"version": STORE_VERSION, "group_col": group_col, "columns": numeric,
+                       "rows": int(len(rows)), "sources": fingerprint}, f)
+        os.chmod(build_dir, 0o777 & ~_current_umask())  # mkdtemp creates it 0700
+        _swap_in(build_dir, store_dir)
+    except OSError as e:
+        print(f"Error building plant store {store_dir}: {e}")
+        shutil.rmtree(build_dir, ignore_errors=True)
+        return None
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+    print(f"Plant store built in {store_dir}: {len(rows)} rows, {len(uniques)} crops")
+    return open_plant_store(store_dir)
+
+def _current_umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+def _swap_in(build_dir, store_dir):
+    """Move a finished build into place without touching the files of the old store.
+
+    The old directory is renamed aside and then removed. Processes that still
+    map its files keep reading them, because unlinked files stay alive until unmapped.
+    """
+    old_dir = None
+    if os.path.exists(store_dir):
+        old_dir = tempfile.mkdtemp(prefix=STORE_DIRNAME + ".old-", dir=os.path.dirname(build_dir))
+        os.replace(store_dir, os.path.join(old_dir, "store"))
+    os.replace(build_dir, store_dir)
+    if old_dir is not None:
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+def open_plant_store(store_dir):
+    try:
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            meta = json.load(f)
+        with open(os.path.join(store_dir, "labels.json")) as f:
+            labels = json.load(f)
+        codes = np.load(os.path.join(store_dir, "codes.npy"), mmap_mode="r")
+        offsets = np.load(os.path.join(store_dir, "offsets.npy"))
+        columns = {col: np.load(_column_file(store_dir, col), mmap_mode="r") for col in meta["columns"]}
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error opening plant store {store_dir}: {e}")
+        return None
+    return PlantStore(store_dir, meta["group_col"], labels, codes, offsets, columns)
+
+def store_is_fresh(folder_path, store_dir=None):
+    store_dir = store_dir or default_store_dir(folder_path)
+    try:
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return meta.get("version") == STORE_VERSION and meta.get("sources") == _source_fingerprint(folder_path)
+
+def load_plant_store(folder_path, store_dir=None):
+    """Open the store for folder_path, (re)building it first if the CSVs changed."""
+    store_dir = store_dir or default_store_dir(folder_path)
+    if store_is_fresh(folder_path, store_dir):
+        store = open_plant_store(store_dir)
+        if store is not None:
+            return store
+    return build_plant_store(folder_path, store_dir)
@@ -0,0 +1,489 @@
+"""Data providers behind the location report.
+
+Single-point fetchers for NASA POWER, Open-Meteo, OpenWeather, SoilGrids and
+OpenTopoData, plus multi-point versions for the providers whose APIs accept
+many coordinates per request, and a whole-year climate fetch for season planning.
+"""
+import calendar
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait
+from datetime import datetime
+
+# OpenWeather API Key (replace with your own if needed)
+OPENWEATHER_API_KEY = ""
+
+### Background Workers
+class _DaemonExecutor:
+    """A fixed set of daemon worker threads, started on first use.
+
+    concurrent.futures joins its workers at interpreter exit, so a provider call
+    that outlived its deadline would keep the process alive for the length of its
+    request timeouts. Daemon workers don't, and because the set is shared and
+    bounded, slow calls queue instead of leaving new threads behind.
+    """
+    def __init__(self, max_workers, name):
+        self.max_workers = max_workers
+        self.name = name
+        self._queue = queue.SimpleQueue()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _work(self):
+        while True:
+            future, fn, args = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def submit(self, fn, *args):
+        with self._lock:
+            if len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, name=f"{self.name}-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        future = Future()
+        self._queue.put((future, fn, args))
+        return future
+
+# Whole-provider calls for deadline-bounded reports, and the single requests they
+# fan out into. They are kept separate so a provider never waits on its own pool.
+PROVIDER_WORKERS = 8
+REQUEST_WORKERS = 16
+_provider_pool = _DaemonExecutor(PROVIDER_WORKERS, "provider")
+_request_pool = _DaemonExecutor(REQUEST_WORKERS, "request")
+
+### API Fetching Functions
+def fetch_api(url, params=None):
+    import requests
+    try:
+        response = requests.get(url, params=params, timeout=10)
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Request error: {url} - {e}")
+    except requests.exceptions.JSONDecodeError:
+        print(f"⚠️ JSON parsing failed: {url}")
+    return None
+
+### Daily Climate Features
+# NASA POWER marks missing days with this fill value
+NASA_FILL_VALUE = -999.0
+GDD_BASE_TEMP = 10.0
+RAINY_DAY_MM = 1.0
+
+def masked_daily_series(series_list, dates):
+    """Stack {YYYYMMDD: value} daily series into a (len(series_list), len(dates)) masked array.
+
+    Fill values, None and days a series lacks are masked. Series whose keys
+    already match dates (the usual case for one NASA POWER response) are
+    converted in one step, without a per-day lookup.
+    """
+    import numpy as np
+    data = np.full((len(series_list), len(dates)), np.nan)
+    for row, series in zip(data, series_list):
+        if not series:
+            continue
+        values = series.values() if list(series) == dates else [series.get(day) for day in dates]
+        row[:] = np.array(list(values), dtype=np.float64)
+    return np.ma.masked_where(np.isnan(data) | (data == NASA_FILL_VALUE), data)
+
+def temperature_features(t2m, base_temp=GDD_BASE_TEMP):
+    """Features over the last (day) axis of masked daily T2M (°C), masked where a series has no valid day."""
+    import numpy as np
+    no_data = t2m.count(axis=-1) == 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        average = t2m.filled(0.0).sum(axis=-1) / t2m.count(axis=-1)
+    return {
+        "Average Temperature (T2M)": np.ma.masked_where(no_data, average),
+        "Minimum Daily Temperature (T2M)":
+            np.ma.masked_where(no_data, t2m.filled(np.inf).min(axis=-1, initial=np.inf)),
+        "Maximum Daily Temperature (T2M)":
+            np.ma.masked_where(no_data, t2m.filled(-np.inf).max(axis=-1, initial=-np.inf)),
+        f"Growing Degree Days (base {base_temp:g}°C)":
+            np.ma.masked_where(no_data, np.maximum(t2m - base_temp, 0).filled(0.0).sum(axis=-1)),
+    }
+
+def precipitation_features(prectot, rainy_mm=RAINY_DAY_MM):
+    """Features over the last (day) axis of masked daily PRECTOT (mm), masked where a series has no valid day.
+
+    A missing day ends a dry spell.
+    """
+    import numpy as np
+    no_data = prectot.count(axis=-1) == 0
+    dry = (prectot < rainy_mm).filled(False)
+    day = np.arange(dry.shape[-1])
+    # Days since the last non-dry day; its maximum is the longest dry spell
+    last_break = np.maximum.accumulate(np.where(dry, -1, day), axis=-1)
+    dry_run = np.where(dry, day - last_break, 0)
+    return {
+        "Total Precipitation (PRECTOT)": np.ma.masked_where(no_data, prectot.filled(0.0).sum(axis=-1)),
+        f"Rainy Days (>= {rainy_mm:g} mm)":
+            np.ma.masked_where(no_data, (prectot >= rainy_mm).filled(False).sum(axis=-1)),
+        "Longest Dry Spell (days)": np.ma.masked_where(no_data, dry_run.max(axis=-1, initial=0)),
+    }
+
+def daily_climate_features(t2m, prectot, base_temp=GDD_BASE_TEMP, rainy_mm=RAINY_DAY_MM):
+    """Climate features over the last (day) axis of masked daily T2M (°C) and PRECTOT (mm) arrays.
+
+    Leading axes are kept, so a (locations x days) or (years x locations x days)
+    stack is reduced in one call. Every feature is a masked array that is masked
+    where its series has no valid day, including zero-length series.
+    """
+    return {**temperature_features(t2m, base_temp), **precipitation_features(prectot, rainy_mm)}
+
+def _report_value(value):
+    """One feature value as a plain number for the report, or "No data" when masked."""
+    import numpy as np
+    if np.ma.is_masked(value):
+        return "No data"
+    value = np.ma.getdata(value)
+    return int(value) if np.issubdtype(value.dtype, np.integer) else float(value)
+
+def get_climate_data(lat, lon, month, year, max_years_back=5, precipitation_fallback=True):
+    """NASA POWER climate for the month, stepping back a year at a time when there is no data.
+
+    When NASA has no precipitation, Open-Meteo is asked for it unless
+    precipitation_fallback is False (the batch report fills it in for many
+    points at once instead).
+    """
+    now = datetime.now()
+    current_year = now.year
+    current_month = now.month
+    adjusted_year = year
+    while adjusted_year > current_year or (adjusted_year == current_year and month > current_month):
+        print(f"Adjusting future date {month}/{year} to {month}/{adjusted_year - 1}.")
+        adjusted_year -= 1
+    attempts = 0
+    while attempts < max_years_back:
+        first_day = 1
+        last_day = calendar.monthrange(adjusted_year, month)[1]
+        start_date = datetime(adjusted_year, month, first_day).strftime("%Y%m%d")
+        end_date = datetime(adjusted_year, month, last_day).strftime("%Y%m%d")
+        print(f"Fetching NASA POWER data for {start_date} to {end_date}...")
+        params = {
+            "parameters": "T2M,PRECTOT",
+            "community": "RE",
+            "longitude": lon,
+            "latitude": lat,
+            "start": start_date,
+            "end": end_date,
+            "format": "JSON"
+        }
+        climate_response = fetch_api("https://power.larc.nasa.gov/api/temporal/daily/point", params)
+        if (climate_response and "properties" in climate_response and 
+            "parameter" in climate_response["properties"]):
+            parameters = climate_response["properties"]["parameter"]
+            t2m_data = parameters.get("T2M", {})
+            prectot_data = parameters.get("PRECTOT", {})
+            dates = list(t2m_data or prectot_data)
+            t2m, prectot = masked_daily_series([t2m_data, prectot_data], dates)
+            if prectot.count() == 0 and precipitation_fallback:
+                print("NASA precipitation missing; trying Open-Meteo...")
+                alternative = _open_meteo_daily_precipitation(lat, lon, start_date, end_date)
+                prectot = masked_daily_series([alternative], dates or list(alternative))[0]
+            features = {name: _report_value(value) for name, value in daily_climate_features(t2m, prectot).items()}
+            avg_t2m = features.pop("Average Temperature (T2M)")
+            total_prectot = features.pop("Total Precipitation (PRECTOT)")
+            if avg_t2m != "No data" or total_prectot != "No data":
+                return {
+                    "Date Range": f"{start_date} to {end_date}",
+                    "Average Temperature (T2M)": avg_t2m,
+                    "Total Precipitation (PRECTOT)": total_prectot,
+                    **features
+                }
+        adjusted_year -= 1
+        attempts += 1
+    return {"Error": f"No climate data for month {month} in past {max_years_back} years from {year}."}
+
+### Season Climate
+SEASON_PARAMETERS = ["T2M", "PRECTOT", "RH2M", "PS"]
+
+def _monthly_normals(series, total=False):
+    """Per-calendar-month normals of a daily {YYYYMMDD: value} series, as a length-12 array.
+
+    -999.0 (and missing) days are skipped. Each (year, month) is reduced to its
+    mean, or its sum when total is True, and the years are then averaged. Months
+    without a single valid day are NaN.
+    """
+    import numpy as np
+    if not series:
+        return np.full(12, np.nan)
+    dates = np.array(list(series.keys()), dtype=np.int64)
+    values = np.array([np.nan if v is None else v for v in series.values()], dtype=np.float64)
+    valid = (values != NASA_FILL_VALUE) & ~np.isnan(values)
+    years = dates // 10000
+    slot = (years - years.min()) * 12 + (dates // 100 % 100 - 1)
+    n_slots = int(years.max() - years.min() + 1) * 12
+    counts = np.bincount(slot[valid], minlength=n_slots).reshape(-1, 12)
+    sums = np.bincount(slot[valid], weights=values[valid], minlength=n_slots).reshape(-1, 12)
+    have = counts > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        per_year = sums if total else sums / counts
+        return np.where(have, per_year, 0.0).sum(axis=0) / have.sum(axis=0)
+
+def _open_meteo_daily_precipitation(lat, lon, start_date, end_date):
+    """Open-Meteo daily precipitation as {YYYYMMDD: mm}, with NASA_FILL_VALUE for missing days."""
+    params = {
+        "latitude": lat,
+        "longitude": lon,
+        "start_date": f"{start_date[:4]}-{start_date[4:6]}-{start_date[6:]}",
+        "end_date": f"{end_date[:4]}-{end_date[4:6]}-{end_date[6:]}",
+        "daily": "precipitation_sum",
+        "timezone": "auto"
+    }
+    return _open_meteo_series(fetch_api("https://archive-api.open-meteo.com/v1/archive", params))
+
+def _open_meteo_series(location):
+    daily = location.get("daily", {}) if location else {}
+    return {day.replace("-", ""): NASA_FILL_VALUE if value is None else value
+            for day, value in zip(daily.get("time", []) or [], daily.get("precipitation_sum", []) or [])}
+
+def get_season_climate(lat, lon, end_year=None, years=1):
+    """Monthly climate for a whole year, or a years-long normal, from one NASA POWER request.
+
+    Covers January of end_year - years + 1 through December of end_year.
+    end_year defaults to, and is capped at, the last complete year. Every value
+    is a list of 12 monthly figures, January first, with None where there is no data:
+
+    - mean temperature (°C)
+    - total precipitation (mm)
+    - relative humidity (%)
+    - surface pressure (hPa)
+    """
+    import numpy as np
+    last_complete = datetime.now().year - 1
+    if end_year is None or end_year > last_complete:
+        end_year = last_complete
+    start_year = end_year - max(1, years) + 1
+    start_date, end_date = f"{start_year}0101", f"{end_year}1231"
+    print(f"Fetching NASA POWER data for {start_date} to {end_date}...")
+    params = {
+        "parameters": ",".join(SEASON_PARAMETERS),
+        "community": "RE",
+        "longitude": lon,
+        "latitude": lat,
+        "start": start_date,
+        "end": end_date,
+        "format": "JSON"
+    }
+    climate_response = fetch_api("https://power.larc.nasa.gov/api/temporal/daily/point", params)
+    if not (climate_response and "properties" in climate_response and
+            "parameter" in climate_response["properties"]):
+        return {"Error": f"No climate data for {start_year}-{end_year}."}
+    parameters = climate_response["properties"]["parameter"]
+    prectot = _monthly_normals(parameters.get("PRECTOT"), total=True)
+    if np.isnan(prectot).all():
+        print("NASA precipitation missing; trying Open-Meteo...")
+        prectot = _monthly_normals(_open_meteo_daily_precipitation(lat, lon, start_date, end_date), total=True)
+
+    def monthly(values):
+        return [None if np.isnan(v) else float(v) for v in values]
+
+    return {
+        "Date Range": f"{start_date} to {end_date}",
+        "Average Temperature (T2M)": monthly(_monthly_normals(parameters.get("T2M"))),
+        "Total Precipitation (PRECTOT)": monthly(prectot),
+        "Relative Humidity (RH2M)": monthly(_monthly_normals(parameters.get("RH2M"))),
+        # POWER reports surface pressure in kPa
+        "Surface Pressure (hPa)": monthly(_monthly_normals(parameters.get("PS")) * 10)
+    }
+
+def get_weather_data(lat, lon):
+    url = "https://api.openweathermap.org/data/2.5/weather"
+    params = {
+        "lat": lat,
+        "lon": lon,
+        "appid": OPENWEATHER_API_KEY,
+        "units": "metric"
+    }
+    return fetch_api(url, params)
+
+def get_soil_data(lat, lon, depth="0-5cm"):
+    url = "https://rest.isric.org/soilgrids/v2.0/properties/query"
+    properties = ["phh2o", "soc", "clay", "silt", "sand", "cec", "cfvo"]
+    # SoilGrids takes one property per request; fetch them all at once
+    futures = {}
+    for prop in properties:
+        params = {
+            "lat": lat,
+            "lon": lon,
+            "property": prop,
+            "depth": depth,
+            "value": "mean"
+        }
+        futures[prop] = _request_pool.submit(fetch_api, url, params)
+    soil_data = {}
+    for prop, future in futures.items():
+        response = future.result()
+        if response and "features" in response and len(response["features"]) > 0:
+            soil_data[prop] = response["features"][0]["properties"].get(prop, {}).get(depth, {}).get("mean", None)
+        else:
+            soil_data[prop] = None
+    return soil_data
+
+def get_terrain_data(lat, lon):
+    url = "https://api.opentopodata.org/v1/srtm90m"
+    params = {"locations": f"{lat},{lon}"}
+    return fetch_api(url, params)
+
+### Location Report
+def _climate_section(climate):
+    return climate if climate else "No climate data retrieved."
+
+def _weather_section(weather_response):
+    if weather_response and "main" in weather_response:
+        main = weather_response["main"]
+        return {
+            "Location": weather_response.get("name", "Unknown"),
+            "Temperature": main.get("temp", "No data"),
+            "Humidity": main.get("humidity", "No data"),
+            "Pressure": main.get("pressure", "No data")
+        }
+    return "No weather data retrieved."
+
+def _soil_section(soil_response):
+    return soil_response if soil_response else "No soil data retrieved."
+
+def _elevation_section(terrain_response=None, elevation=None):
+    if elevation is None and terrain_response and "results" in terrain_response and len(terrain_response["results"]) > 0:
+        elevation = terrain_response["results"][0].get("elevation", "No data")
+    if elevation is not None:
+        return {"Elevation (meters)": elevation}
+    return "No elevation data retrieved."
+
+def get_location_info(lat, lon, month, year, elevation=None, climate=None):
+    """Build the location report; pass elevation or climate when they were already fetched in bulk."""
+    report = {}
+    report["Climate Data"] = get_climate_data(lat, lon, month, year) if climate is None else climate
+    report["Weather Data"] = _weather_section(get_weather_data(lat, lon))
+    report["Soil Data (Depth 0-5cm)"] = _soil_section(get_soil_data(lat, lon))
+    terrain_response = get_terrain_data(lat, lon) if elevation is None else None
+    report["Elevation Data"] = _elevation_section(terrain_response, elevation)
+    return report
+
+def get_location_info_within(lat, lon, month, year, timeout):
+    """Query every provider concurrently and return what arrived within timeout seconds.
+
+    Returns (report, late). late lists the report sections whose provider had not
+    answered in time; those sections say so instead of holding data. Calls
+    that miss the deadline are not waited for. They finish in the background on
+    the shared daemon workers, which never delay interpreter exit.
+    """
+    futures = {
+        "Climate Data": _provider_pool.submit(get_climate_data, lat, lon, month, year),
+        "Weather Data": _provider_pool.submit(get_weather_data, lat, lon),
+        "Soil Data (Depth 0-5cm)": _provider_pool.submit(get_soil_data, lat, lon),
+        "Elevation Data": _provider_pool.submit(get_terrain_data, lat, lon),
+    }
+    done, _ = wait(futures.values(), timeout=max(0.0, timeout))
+    for future in futures.values():
+        future.cancel()  # drops calls still queued behind earlier slow ones
+    builders = {
+        "Climate Data": _climate_section,
+        "Weather Data": _weather_section,
+        "Soil Data (Depth 0-5cm)": _soil_section,
+        "Elevation Data": _elevation_section,
+    }
+    report, late = {}, []
+    for section, future in futures.items():
+        if future not in done:
+            report[section] = f"Not retrieved within {timeout:.1f}s deadline."
+            late.append(section)
+            continue
+        try:
+            response = future.result()
+        except Exception as e:
+            print(f"Error fetching {section}: {e}")
+            response = None
+        report[section] = builders[section](response)
+    return report, late
+
+def get_location_info_batch(points, month, year):
+    """Reports for many (lat, lon) points, in input order, with elevation fetched in bulk.
+
+    NASA POWER's daily point API, OpenWeather's coordinate lookup and SoilGrids
+    only take one point per request, so those are still fetched per point.
+    Precipitation that NASA is missing comes from one Open-Meteo request per
+    date range for all affected points, instead of one request per point.
+    """
+    points = list(points)
+    elevations = get_terrain_data_batch(points)
+    climates = [get_climate_data(lat, lon, month, year, precipitation_fallback=False) for lat, lon in points]
+    _fill_precipitation_batch(points, climates)
+    return [get_location_info(lat, lon, month, year, elevation=elevation, climate=climate)
+            for (lat, lon), elevation, climate in zip(points, elevations, climates)]
+
+def _fill_precipitation_batch(points, climates):
+    """Fill the precipitation fields NASA left empty from batched Open-Meteo series, in place."""
+    missing = {}
+    for i, climate in enumerate(climates):
+        if climate.get("Total Precipitation (PRECTOT)") == "No data":
+            missing.setdefault(climate["Date Range"], []).append(i)
+    for date_range, indices in missing.items():
+        start_date, end_date = date_range.split(" to ")
+        print(f"NASA precipitation missing for {len(indices)} points; trying Open-Meteo...")
+        series = get_alternative_precipitation_batch([points[i] for i in indices], start_date, end_date)
+        dates = next((list(s) for s in series if s), [])
+        features = precipitation_features(masked_daily_series(series, dates))
+        for row, i in enumerate(indices):
+            climates[i].update({name: _report_value(values[row]) for name, values in features.items()})
+
+### Multi-point Fetching
+# OpenTopoData's public API takes at most 100 locations per call and one call per second
+OPENTOPODATA_MAX_LOCATIONS = 100
+OPENTOPODATA_MIN_INTERVAL = 1.0
+# Open-Meteo has no documented cap on coordinate lists; this keeps request URLs short
+OPEN_METEO_MAX_LOCATIONS = 100
+
+def _batches(points, size):
+    for start in range(0, len(points), size):
+        yield start, points[start:start + size]
+
+def get_terrain_data_batch(points, batch_size=OPENTOPODATA_MAX_LOCATIONS, min_interval=OPENTOPODATA_MIN_INTERVAL):
+    """Elevation in meters for each (lat, lon), in input order; None where unavailable."""
+    url = "https://api.opentopodata.org/v1/srtm90m"
+    points = list(points)
+    elevations = [None] * len(points)
+    last_call = None
+    for start, batch in _batches(points, batch_size):
+        if last_call is not None:
+            time.sleep(max(0.0, min_interval - (time.monotonic() - last_call)))
+        last_call = time.monotonic()
+        params = {"locations": "|".join(f"{lat},{lon}" for lat, lon in batch)}
+        response = fetch_api(url, params)
+        results = response.get("results") if response else None
+        if not results or len(results) != len(batch):
+            continue
+        for offset, result in enumerate(results):
+            elevations[start + offset] = result.get("elevation")
+    return elevations
+
+def get_alternative_precipitation_batch(points, start_date, end_date, batch_size=OPEN_METEO_MAX_LOCATIONS):
+    """Open-Meteo daily precipitation {YYYYMMDD: mm} for each (lat, lon), in input order ({} where missing)."""
+    start_date_alt = f"{start_date[:4]}-{start_date[4:6]}-{start_date[6:]}"
+    end_date_alt = f"{end_date[:4]}-{end_date[4:6]}-{end_date[6:]}"
+    url = "https://archive-api.open-meteo.com/v1/archive"
+    points = list(points)
+    series = [{} for _ in points]
+    for start, batch in _batches(points, batch_size):
+        params = {
+            "latitude": ",".join(str(lat) for lat, _ in batch),
+            "longitude": ",".join(str(lon) for _, lon in batch),
+            "start_date": start_date_alt,
+            "end_date": end_date_alt,
+            "daily": "precipitation_sum",
+            "timezone": "auto"
+        }
+        response = fetch_api(url, params)
+        # A single coordinate comes back as one object, several as a list in request order
+        locations = [response] if isinstance(response, dict) else response
+        if not locations or len(locations) != len(batch):
+            continue
+        for offset, location in enumerate(locations):
+            series[start + offset] = _open_meteo_series(location)
+    return series
@@ -0,0 +1,46 @@
+"""Slim entry point: score a cached location report against cached crop profiles.
+
+Usage: python quick_score.py [report_csv|-] [profile_cache_json]
+
+Without a report CSV (or with "-"), the newest report in the local report store is scored.
+
+Nothing heavy (pandas, requests, PIL, tkinter) is imported, so this answers in
+milliseconds once Full.py / Full-No GUI.py have written the profile cache.
+"""
+import sys
+from plant_core import (read_report_from_csv, get_sensor_data_from_report, recommend_crop,
+                        load_profile_cache, PROFILE_CACHE_PATH)
+from report_store import open_report_store, latest_report
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    report_path = argv[0] if len(argv) > 0 and argv[0] != "-" else None
+    cache_path = argv[1] if len(argv) > 1 else PROFILE_CACHE_PATH
+    cached = load_profile_cache(cache_path)
+    if cached is None:
+        print("Run Full.py or Full-No GUI.py once to build the profile cache.")
+        return 1
+    optimal_conditions, sigmas, weights = cached
+    if not optimal_conditions:
+        print("Error: Profile cache contains no crops.")
+        return 1
+    if report_path is not None:
+        report = read_report_from_csv(report_path)
+    else:
+        store = open_report_store()
+        stored = latest_report(store) if store is not None else None
+        if stored is None:
+            print("Error: No stored location reports yet.")
+            return 1
+        report = stored[1]
+    sensor_data = get_sensor_data_from_report(report)
+    missing = [key for key, value in sensor_data.items() if value is None]
+    if missing:
+        print(f"Error: Cached report is missing values for {', '.join(missing)}.")
+        return 1
+    best_crop, best_fitness, _ = recommend_crop(sensor_data, optimal_conditions, sigmas, weights)
+    print(f"Recommended Crop: {best_crop} (Fitness Score: {best_fitness:.4f})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Append-only SQLite history of location reports and recommendation results.
+
+Replaces the single overwritten location_data_report.csv: every run appends a
+row, reports are indexed on (lat, lon, month, year) and on time, and WAL mode
+lets several runs write at once without clobbering each other.
+"""
+import json
+import os
+import sqlite3
+from datetime import datetime, timedelta
+
+# Set PLANT_REPORT_DB to keep the history somewhere else
+REPORT_DB_PATH = os.environ.get('PLANT_REPORT_DB', '/Users/michael_z/Downloads/location_reports.sqlite3')
+# Weather readings go stale quickly, so stored reports are only reused for a few hours
+REPORT_MAX_AGE_HOURS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    month INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    report_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reports_location ON reports (lat, lon, month, year);
+CREATE INDEX IF NOT EXISTS idx_reports_created ON reports (created_at);
+CREATE TABLE IF NOT EXISTS recommendations (
+    id INTEGER PRIMARY KEY,
+    report_id INTEGER NOT NULL REFERENCES reports (id),
+    created_at TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    best_crop TEXT NOT NULL,
+    best_fitness REAL NOT NULL,
+    scores_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_recommendations_report ON recommendations (report_id);
+CREATE INDEX IF NOT EXISTS idx_recommendations_created ON recommendations (created_at);
+CREATE INDEX IF NOT EXISTS idx_recommendations_crop ON recommendations (best_crop, created_at);
+"""
+
+def open_report_store(filepath=REPORT_DB_PATH):
+    """Open (and create if needed) the history database; None if it cannot be opened."""
+    try:
+        conn = sqlite3.connect(filepath, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+    except sqlite3.Error as e:
+        print(f"Error opening report store {filepath}: {e}")
+        return None
+    return conn
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+### Writing
+def save_report(conn, lat, lon, month, year, report):
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO reports (created_at, lat, lon, month, year, report_json) VALUES (?, ?, ?, ?, ?, ?)",
+            (_now(), lat, lon, month, year, json.dumps(report, default=str)))
+    return cursor.lastrowid
+
+def save_recommendation(conn, report_id, mode, best_crop, best_fitness, crop_fitness, top_n=25):
+    """Record a result; only the top_n scores are kept (None keeps every crop)."""
+    ranked = sorted(crop_fitness.items(), key=lambda item: item[1], reverse=True)
+    if top_n is not None:
+        ranked = ranked[:top_n]
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO recommendations (report_id, created_at, mode, best_crop, best_fitness, scores_json) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (report_id, _now(), mode, str(best_crop), float(best_fitness),
+             json.dumps({str(crop): float(score) for crop, score in ranked})))
+    return cursor.lastrowid
+
+### Reading
+def find_report(conn, lat, lon, month, year, max_age_hours=None, tolerance=1e-4):
+    """Return (report_id, report) for the newest matching report, or None."""
+    query = ("SELECT id, report_json FROM reports WHERE lat BETWEEN ? AND ? AND lon BETWEEN ? AND ? "
+             "AND month = ? AND year = ?")
+    params = [lat - tolerance, lat + tolerance, lon - tolerance, lon + tolerance, month, year]
+    if max_age_hours is not None:
+        query += " AND created_at >= ?"
+        params.append((datetime.now() - timedelta(hours=max_age_hours)).isoformat(timespec="seconds"))
+    row = conn.execute(query + " ORDER BY created_at DESC, id DESC LIMIT 1", params).fetchone()
+    if row is None:
+        return None
+    return row["id"], json.loads(row["report_json"])
+
+def nearest_reports(conn, lat, lon, month, radius=1.0, limit=20):
+    """Yield (distance, report_id, report) for same-month reports within radius degrees, nearest first.
+
+    The bounding box is answered from the location index; distances are plain
+    degree offsets, which is enough to rank neighbours.
+    """
+    rows = conn.execute(
+        "SELECT id, lat, lon, report_json FROM reports WHERE lat BETWEEN ? AND ? AND lon BETWEEN ? AND ? "
+        "AND month = ?",
+        (lat - radius, lat + radius, lon - radius, lon + radius, month)).fetchall()
+    ranked = sorted(rows, key=lambda row: ((row["lat"] - lat) ** 2 + (row["lon"] - lon) ** 2, -row["id"]))
+    for row in ranked[:limit]:
+        distance = ((row["lat"] - lat) ** 2 + (row["lon"] - lon) ** 2) ** 0.5
+        yield distance, row["id"], json.loads(row["report_json"])
+
+def latest_report(conn):
+    row = conn.execute("SELECT id, report_json FROM reports ORDER BY created_at DESC, id DESC LIMIT 1").fetchone()
+    if row is None:
+        return None
+    return row["id"], json.loads(row["report_json"])
+
+def report_history(conn, since=None, until=None, limit=None):
+    """Yield report rows (without the JSON body) between two ISO timestamps."""
+    query = "SELECT id, created_at, lat, lon, month, year FROM reports WHERE 1 = 1"
+    params = []
+    if since is not None:
+        query += " AND created_at >= ?"
+        params.append(since)
+    if until is not None:
+        query += " AND created_at < ?"
+        params.append(until)
+    query += " ORDER BY created_at"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    for row in conn.execute(query, params):
+        yield dict(row)
+
+def best_crop_counts(conn, since=None):
+    """How often each crop won, answered from the (best_crop, created_at) index."""
+    query = "SELECT best_crop, COUNT(*) AS wins FROM recommendations"
+    params = []
+    if since is not None:
+        query += " WHERE created_at >= ?"
+        params.append(since)
+    query += " GROUP BY best_crop ORDER BY wins DESC"
+    return {row["best_crop"]: row["wins"] for row in conn.execute(query, params)}
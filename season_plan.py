@@ -0,0 +1,46 @@
+"""Season planning entry point: best planting months for a location.
+
+Usage: python season_plan.py lat lon [years] [end_year] [k]
+
+Fetches a year (or a years-long normal ending at end_year) of monthly climate in
+one request, scores every month against every crop, and prints the top k crops
+with their planting windows.
+"""
+import calendar
+import sys
+
+from engine import RecommendationEngine
+
+def format_window(window):
+    first, last, mean_fitness = window
+    months = calendar.month_abbr[first] if first == last else f"{calendar.month_abbr[first]}-{calendar.month_abbr[last]}"
+    return f"{months} ({mean_fitness:.4f})"
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2:
+        print(__doc__)
+        return 1
+    lat, lon = float(argv[0]), float(argv[1])
+    years = int(argv[2]) if len(argv) > 2 else 1
+    end_year = int(argv[3]) if len(argv) > 3 else None
+    k = int(argv[4]) if len(argv) > 4 else 10
+
+    engine = RecommendationEngine()
+    plan = engine.plan_season(lat, lon, end_year=end_year, years=years, k=k)
+    if plan is None:
+        print("Error: No crop data found.")
+        return 1
+    if "Error" in plan["climate"]:
+        print(f"Warning: {plan['climate']['Error']} Using default sensor values.")
+    for key, months in plan["defaulted"].items():
+        print(f"Default value used for {key} in months {', '.join(map(str, months))}.")
+    print(f"\n=== Planting Windows ({plan['climate'].get('Date Range', 'no climate data')}) ===")
+    for entry in plan["crops"]:
+        windows = ", ".join(format_window(window) for window in entry["windows"])
+        print(f"{entry['crop']}: best {calendar.month_name[entry['best_month']]} "
+              f"(Fitness Score: {entry['best_fitness']:.4f}); windows {windows}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())